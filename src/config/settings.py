@@ -1,3 +1,4 @@
+import functools
 import json
 from typing import List, Dict, Any
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -20,6 +21,14 @@ class Settings(BaseSettings):
     files: str = os.getenv("FILES", "[]")  # Expecting a JSON string of file info
     embedding_model: str = os.getenv("EMBEDDING_MODEL", "nomic-embed-text:latest")
     llm_model: str = os.getenv("LLM_MODEL", "qwen3:latest")
+    # Hugging Face tokenizer used to measure chunk sizes in tokens; should
+    # match EMBEDDING_MODEL.
+    chunk_tokenizer: str = os.getenv(
+        "CHUNK_TOKENIZER", "nomic-ai/nomic-embed-text-v1.5"
+    )
+    # Child chunking: "token" (fixed token windows) or "semantic"
+    # (SemanticChunker; needs the optional langchain-experimental package).
+    chunking_strategy: str = os.getenv("CHUNKING_STRATEGY", "token")
 
     # MinIO settings
     minio_endpoint: str = os.getenv("MINIO_ENDPOINT", "localhost:9000")
@@ -30,15 +39,26 @@ class Settings(BaseSettings):
     # Processing strategy: "embed" (vector) or "vectorless" (tree index)
     process_type: str = os.getenv("PROCESS_TYPE", "embed")
 
+    # Parallelism: number of worker processes used to ingest files.
+    # 0 means "auto": one worker per visible GPU (times WORKERS_PER_GPU), or a
+    # single worker on CPU-only hosts. Always capped at the CPU count.
+    max_workers: int = int(os.getenv("MAX_WORKERS", "0"))
+    workers_per_gpu: int = int(os.getenv("WORKERS_PER_GPU", "1"))
+
+    # Maximum number of image-description requests in flight to the LLM.
+    max_image_concurrency: int = int(os.getenv("MAX_IMAGE_CONCURRENCY", "3"))
+
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
     )
 
-    @property
+    @functools.cached_property
     def files_list(self) -> List[Dict[str, Any]]:
         """
         Parse the FILES environment variable as JSON.
 
+        Parsed on first access and cached on the instance afterwards.
+
         Returns:
             List[Dict[str, Any]]: A list of file dictionaries.
         """
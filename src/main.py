@@ -1,5 +1,12 @@
+import asyncio
+import functools
+import multiprocessing
 import os
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
 
 # Ensure the project root is on sys.path so `python src/main.py` works as well
 # as `uv run src/main.py` or running from within an activated virtual env.
@@ -7,10 +14,12 @@ _project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if _project_root not in sys.path:
     sys.path.insert(0, _project_root)
 
+import torch
+from docling.datamodel.base_models import InputFormat
 from langchain_core.documents import Document
 
 from src.config.settings import settings
-from src.processing.document_processor import process_pdf
+from src.processing.document_processor import get_pdf_converter, process_pdf
 from src.storage.vector_store import embed_file
 from src.storage.vectorless import get_tree, summarize_leaves
 from src.storage.tree_store import store_tree
@@ -20,14 +29,42 @@ from src.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
-def generate_embedding(file_path: str, file_id: str, file_name: str) -> bool:
+def _install_event_loop_policy() -> None:
+    """
+    Make ``asyncio.run`` use uvloop where it is available.
+
+    uvloop isn't supported on Windows, where the default loop is kept.
+    """
+    if sys.platform == "win32":
+        return
+    try:
+        import uvloop
+    except ImportError:
+        logger.debug("uvloop not installed; using the default asyncio event loop")
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+# Runs on import so spawned worker processes pick it up as well.
+_install_event_loop_policy()
+
+
+def generate_embedding(
+    file_path: str,
+    file_id: str,
+    file_name: str,
+    pdf_bytes: Optional[bytes] = None,
+) -> bool:
     """
     Process a PDF file and generate embeddings for it.
 
     Args:
-        file_path (str): The local path to the downloaded PDF file.
+        file_path (str): The local path to the PDF file, or its MinIO object
+            key when ``pdf_bytes`` is given; stored as the chunks' ``source``.
         file_id (str): The unique identifier for the file.
         file_name (str): The name of the file.
+        pdf_bytes (Optional[bytes], optional): The PDF content, processed in
+            memory instead of reading ``file_path``. Defaults to None.
 
     Returns:
         bool: True if embedding was successful, False otherwise.
@@ -35,7 +72,7 @@ def generate_embedding(file_path: str, file_id: str, file_name: str) -> bool:
     logger.info(f"Generating embedding for {file_name} (ID: {file_id}) at {file_path}")
 
     try:
-        pages = process_pdf(file_path)
+        pages = process_pdf(pdf_bytes if pdf_bytes is not None else file_path)
 
         if not pages:
             logger.warning(f"No pages extracted from {file_name}")
@@ -86,6 +123,135 @@ def generate_embedding(file_path: str, file_id: str, file_name: str) -> bool:
         return False
 
 
+# Background thread loading the Docling models for this process.
+_converter_warmup: Optional[threading.Thread] = None
+
+
+def _warm_up_converter() -> None:
+    """
+    Build the cached PDF converter and load its pipeline models.
+
+    Docling only loads the layout, OCR, table and picture models on the first
+    conversion, so building the converter alone leaves all of that on the
+    critical path; ``initialize_pipeline`` loads them up front.
+    """
+    converter = get_pdf_converter()
+    if converter is None:
+        # get_pdf_converter has logged why; process_pdf will report it too.
+        return
+    try:
+        converter.initialize_pipeline(InputFormat.PDF)
+    except Exception:
+        logger.exception("Failed to load the PDF pipeline models")
+
+
+def _start_converter_warmup() -> threading.Thread:
+    """
+    Start loading the PDF converter in a background thread, once per process.
+
+    The converter and its initialized pipeline are cached, so the warm-up
+    lets model loading overlap with the MinIO download of the first file.
+
+    Returns:
+        threading.Thread: The warm-up thread; join it before converting.
+    """
+    global _converter_warmup
+    if _converter_warmup is None:
+        _converter_warmup = threading.Thread(
+            target=_warm_up_converter, name="converter-warmup", daemon=True
+        )
+        _converter_warmup.start()
+    return _converter_warmup
+
+
+@functools.lru_cache(maxsize=1)
+def _get_worker_client() -> MinioClient:
+    """
+    Return this process's MinIO client, creating it on first use.
+
+    Clients are not shared across processes; each worker keeps one client,
+    and its connection pool, for every file it downloads.
+    """
+    return MinioClient()
+
+
+def _init_worker(gpu_queue: Optional[Any]) -> None:
+    """
+    Initializer for ingestion worker processes.
+
+    Pins the worker to a single GPU by setting ``CUDA_VISIBLE_DEVICES`` before
+    any CUDA context is created, so each process owns one device, then starts
+    warming up the PDF converter.
+
+    Args:
+        gpu_queue (Optional[Any]): Queue of GPU ids to claim from, or None on
+            CPU-only hosts.
+    """
+    if gpu_queue is not None:
+        gpu_id = gpu_queue.get()
+        os.environ["CUDA_VISIBLE_DEVICES"] = str(gpu_id)
+        logger.info(f"Worker {os.getpid()} pinned to GPU {gpu_id}")
+
+    _start_converter_warmup()
+
+
+def _resolve_worker_count(num_files: int, num_gpus: int) -> int:
+    """
+    Decide how many worker processes to use for file ingestion.
+
+    Args:
+        num_files (int): Number of files to process.
+        num_gpus (int): Number of visible CUDA devices.
+
+    Returns:
+        int: The number of workers, at least 1.
+    """
+    cpu_count = os.cpu_count() or 1
+
+    if settings.max_workers > 0:
+        workers = settings.max_workers
+    else:
+        workers = max(num_gpus, 1) * max(settings.workers_per_gpu, 1)
+
+    return max(1, min(workers, cpu_count, num_files))
+
+
+def _process_one(file: Dict[str, Any]) -> bool:
+    """
+    Download a single file from MinIO and generate its embedding.
+
+    Runs inside a worker process, so it uses the worker's own MinIO client
+    rather than sharing the parent's.
+
+    Args:
+        file (Dict[str, Any]): File entry with 'path', 'id' and 'name' keys.
+
+    Returns:
+        bool: True if the file was processed successfully, False otherwise.
+    """
+    file_path = file.get("path")
+    file_id = file.get("id")
+    file_name = file.get("name")
+
+    if not all([file_path, file_id, file_name]):
+        logger.warning(f"Skipping invalid file entry: {file}")
+        return False
+
+    try:
+        warmup = _start_converter_warmup()
+
+        # The PDF is kept in memory; it is never written to temporary_folder.
+        client = _get_worker_client()
+        pdf_bytes = client.download_to_bytes(file_path)
+
+        # Models usually finished loading while the download was running.
+        warmup.join()
+        return generate_embedding(file_path, file_id, file_name, pdf_bytes=pdf_bytes)
+    except Exception as e:
+        logger.error(f"Failed to process file {file_name}: {e}")
+        return False
+
+
 def main() -> None:
     """
     Main entry point for the application.
@@ -110,27 +276,46 @@ def main() -> None:
         files_list = settings.files_list
         logger.info(f"Processing {len(files_list)} files for embedding generation...")
 
-        for file in files_list:
-            file_path = file.get("path")
-            file_id = file.get("id")
-            file_name = file.get("name")
+        if not files_list:
+            return
 
-            if not all([file_path, file_id, file_name]):
-                logger.warning(f"Skipping invalid file entry: {file}")
-                continue
+        num_gpus = torch.cuda.device_count() if torch.cuda.is_available() else 0
+        max_workers = _resolve_worker_count(len(files_list), num_gpus)
 
-            download_file_path = os.path.join(
-                settings.temporary_folder, os.path.basename(file_path)
-            )
+        # "spawn" keeps CUDA, torch thread pools and HTTP clients out of the
+        # children; every worker starts from a clean interpreter.
+        ctx = multiprocessing.get_context("spawn")
+        gpu_queue = None
+        if num_gpus:
+            gpu_queue = ctx.Queue()
+            for worker_idx in range(max_workers):
+                gpu_queue.put(worker_idx % num_gpus)
+
+        logger.info(f"Using {max_workers} worker process(es), {num_gpus} GPU(s)")
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(gpu_queue,),
+        ) as executor:
+            futures = {
+                executor.submit(_process_one, file): file for file in files_list
+            }
+            # A worker that dies (e.g. OOM-killed) breaks the pool and fails
+            # every unfinished file; handled per future, the files already
+            # done keep their results and each lost file is logged.
+            succeeded = 0
+            for future in as_completed(futures):
+                file_name = futures[future].get("name")
+                try:
+                    succeeded += bool(future.result())
+                except BrokenProcessPool:
+                    logger.error(f"Worker process died while processing {file_name}")
+                except Exception as e:
+                    logger.error(f"Failed to process file {file_name}: {e}")
 
-            try:
-                client.download_file(
-                    file_path,
-                    download_file_path,
-                )
-                generate_embedding(download_file_path, file_id, file_name)
-            except Exception as e:
-                logger.error(f"Failed to process file {file_name}: {e}")
+        logger.info(f"Processed {succeeded}/{len(files_list)} files successfully")
 
     except Exception as e:
         logger.exception("Application encountered a fatal error")
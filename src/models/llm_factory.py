@@ -1,3 +1,5 @@
+import functools
+
 from langchain_ollama import ChatOllama
 from src.config.settings import settings
 from src.utils.logger import get_logger
@@ -5,9 +7,13 @@ from src.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
-def get_llm_client() -> ChatOllama:
+def create_llm_client() -> ChatOllama:
     """
-    Get an instance of the ChatOllama LLM client.
+    Create a new instance of the ChatOllama LLM client.
+
+    Its async httpx client binds to the event loop it is first used on, so
+    coroutines run under a fresh ``asyncio.run`` should create their own
+    instead of sharing :func:`get_llm_client`'s.
 
     Returns:
         ChatOllama: The configured LLM client.
@@ -23,3 +29,17 @@ def get_llm_client() -> ChatOllama:
     except Exception as e:
         logger.exception("Failed to initialize LLM client")
         raise
+
+
+@functools.lru_cache(maxsize=1)
+def get_llm_client() -> ChatOllama:
+    """
+    Get the shared instance of the ChatOllama LLM client.
+
+    The client is created on first use and reused afterwards by synchronous
+    ``invoke`` calls; async callers should use :func:`create_llm_client`.
+
+    Returns:
+        ChatOllama: The configured LLM client.
+    """
+    return create_llm_client()
@@ -1,11 +1,12 @@
 import asyncio
+import functools
 import gc
+import io
 import os
-import re
-import traceback
-from typing import Optional, List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, List, Dict, Any, Iterator, Tuple, Union
 
-import PyPDF2
+from pypdf import PdfReader, PdfWriter
 import torch
 from docling.document_converter import DocumentConverter, PdfFormatOption
 from docling.datamodel.pipeline_options import (
@@ -15,155 +16,149 @@ from docling.datamodel.pipeline_options import (
     EasyOcrOptions,
     TableStructureOptions,
 )
-from docling.datamodel.base_models import InputFormat
+from docling.datamodel.base_models import (
+    ConversionStatus,
+    DocumentStream,
+    InputFormat,
+)
 from docling.datamodel.accelerator_options import AcceleratorDevice, AcceleratorOptions
+from docling_core.types.doc import DoclingDocument, ImageRefMode, PictureItem
 
 from src.config.settings import settings
 from src.utils.logger import get_logger
 from src.processing.image_processor import (
+    IMAGE_PLACEHOLDER,
     extract_context_around_image,
-    extract_images_from_markdown,
+    extract_images_from_page,
     process_images_async,
     replace_images_with_descriptions,
 )
 
 logger = get_logger(__name__)
 
+_PAGE_BREAK = "<!-- page break -->"
+
+
+def _iter_split_writers(
+    pdf_reader: PdfReader, pages_per_split: int
+) -> Iterator[Tuple[int, PdfWriter, int, int]]:
+    """
+    Yield ``(split_number, writer, start_page, end_page)`` for each page range.
+
+    ``split_number`` and ``start_page`` are 1-indexed; ``end_page`` is inclusive.
+    """
+    total_pages = len(pdf_reader.pages)
+    for i in range(0, total_pages, pages_per_split):
+        end_page = min(i + pages_per_split, total_pages)
+
+        # append() clones the page range from the already-parsed reader
+        # instead of re-tokenizing every page's content stream.
+        pdf_writer = PdfWriter()
+        pdf_writer.append(pdf_reader, pages=(i, end_page), import_outline=False)
+        yield i // pages_per_split + 1, pdf_writer, i + 1, end_page
+
 
-def split_pdf(input_path: str, pages_per_split: int = 10) -> List[Dict[str, Any]]:
+def iter_split_pdf(
+    input_path: str, pages_per_split: int = 10
+) -> Iterator[Dict[str, Any]]:
     """
-    Split a PDF into smaller chunks.
+    Split a PDF into smaller chunks, yielding each one as soon as it is written.
 
     Args:
         input_path (str): The path to the input PDF file.
         pages_per_split (int, optional): Number of pages per split. Defaults to 10.
 
-    Returns:
-        List[Dict[str, Any]]: A list of dictionaries containing split file info.
+    Yields:
+        Dict[str, Any]: Split file info with 'file', 'start_page' and 'end_page'.
     """
     os.makedirs(settings.temporary_folder, exist_ok=True)
-    split_files = []
+    # Prefix splits with the source name so concurrent workers never collide.
+    split_prefix = os.path.splitext(os.path.basename(input_path))[0]
 
     with open(input_path, "rb") as file:
-        pdf_reader = PyPDF2.PdfReader(file)
-        total_pages = len(pdf_reader.pages)
-
-        for i in range(0, total_pages, pages_per_split):
-            pdf_writer = PyPDF2.PdfWriter()
-
-            # Add pages to current split
-            end_page = min(i + pages_per_split, total_pages)
-            for page_num in range(i, end_page):
-                pdf_writer.add_page(pdf_reader.pages[page_num])
+        pdf_reader = PdfReader(file)
 
+        for number, pdf_writer, start_page, end_page in _iter_split_writers(
+            pdf_reader, pages_per_split
+        ):
             # Save split PDF
-            output_filename = f"split_{i//pages_per_split + 1}.pdf"
+            output_filename = f"{split_prefix}_split_{number}.pdf"
             output_path = os.path.join(settings.temporary_folder, output_filename)
 
             with open(output_path, "wb") as output_file:
                 pdf_writer.write(output_file)
 
-            split_files.append(
-                {
-                    "file": output_path,
-                    "start_page": i + 1,  # 1-indexed
-                    "end_page": end_page,
-                }
-            )
-
-    return split_files
+            yield {
+                "file": output_path,
+                "start_page": start_page,
+                "end_page": end_page,
+            }
 
 
-def combine_markdown_files(markdown_parts: List[Dict[str, Any]]) -> str:
+def iter_split_pdf_bytes(
+    data: bytes, pages_per_split: int = 10
+) -> Iterator[Dict[str, Any]]:
     """
-    Combine multiple markdown parts into one.
+    Split an in-memory PDF into smaller in-memory PDFs; nothing touches disk.
 
     Args:
-        markdown_parts (List[Dict[str, Any]]): List of markdown parts.
+        data (bytes): The content of the input PDF file.
+        pages_per_split (int, optional): Number of pages per split. Defaults to 10.
 
-    Returns:
-        str: The combined markdown string.
+    Yields:
+        Dict[str, Any]: Split info with 'file' (a name for logging), 'pdf_bytes',
+        'start_page' and 'end_page'.
     """
-    combined_markdown = ""
+    pdf_reader = PdfReader(io.BytesIO(data))
 
-    for part in markdown_parts:
-        if part.get("markdown"):
-            combined_markdown += part["markdown"]
-            combined_markdown += "\n\n"
-            combined_markdown += "<!-- page break -->"
-            if not combined_markdown.endswith("\n"):
-                combined_markdown += "\n\n"
+    for number, pdf_writer, start_page, end_page in _iter_split_writers(
+        pdf_reader, pages_per_split
+    ):
+        buffer = io.BytesIO()
+        pdf_writer.write(buffer)
 
-    return combined_markdown
+        yield {
+            "file": f"split_{number}.pdf",
+            "pdf_bytes": buffer.getvalue(),
+            "start_page": start_page,
+            "end_page": end_page,
+        }
 
 
-def split_markdown_by_pages(markdown_text: str) -> List[Dict[str, Any]]:
+def split_markdown_on_page_breaks(
+    markdown_text: str, start_page: int = 1
+) -> List[Dict[str, Any]]:
     """
-    Split combined markdown text into per-page sections based on {N} page markers.
+    Split a single split's markdown into per-page sections.
 
-    The combined markdown uses ``{N}`` as page-boundary markers (produced by
-    :func:`replace_page_breaks_with_numbers`).  Content *before* the first
-    marker belongs to page 1, content *between* marker ``{k}`` and ``{k+1}``
-    belongs to page ``k+1``, and so on.
+    Docling places ``<!-- page break -->`` between consecutive pages, so the
+    k-th section belongs to page ``start_page + k``.  Empty pages are dropped.
 
     Args:
-        markdown_text (str): The combined markdown with ``{N}`` page markers.
+        markdown_text (str): Markdown exported for one split.
+        start_page (int, optional): Page number of the split's first page. Defaults to 1.
 
     Returns:
         List[Dict[str, Any]]: Ordered list of dicts, each with keys
         ``'page_number'`` (int, 1-indexed) and ``'markdown'`` (str).
     """
-    # Split on {N} markers while capturing the numeric group
-    parts = re.split(r"\{(\d+)\}", markdown_text)
-
     pages: List[Dict[str, Any]] = []
-    # parts layout after split:
-    #   parts[0]            – content before {1}  → page 1
-    #   parts[1], parts[2]  – "1", content after {1} → page 2
-    #   parts[3], parts[4]  – "2", content after {2} → page 3
-    #   …
-    # Even-indexed entries are page content; odd-indexed are the marker digits.
-    for i, part in enumerate(parts):
-        if i % 2 == 0:
-            content = part.strip()
-            if content:
-                page_number = (i // 2) + 1
-                pages.append({"page_number": page_number, "markdown": content})
+    for offset, part in enumerate(markdown_text.split(_PAGE_BREAK)):
+        content = part.strip()
+        if content:
+            pages.append({"page_number": start_page + offset, "markdown": content})
 
     return pages
 
 
-def replace_page_breaks_with_numbers(markdown_text: str, start_page: int = 1) -> str:
-    """
-    Replace page break placeholders with actual page numbers.
-
-    Args:
-        markdown_text (str): The markdown text containing page breaks.
-        start_page (int, optional): The starting page number. Defaults to 1.
-
-    Returns:
-        str: The updated markdown text.
-    """
-    page_break_pattern = r"<!-- page break -->"
-
-    current_page = start_page
-
-    def replace_page_break(match: re.Match) -> str:
-        nonlocal current_page
-        replacement = f"{{{current_page}}}"
-        current_page += 1
-        return replacement
-
-    # Replace page breaks with page numbers
-    updated_markdown = re.sub(page_break_pattern, replace_page_break, markdown_text)
-
-    return updated_markdown
-
-
+@functools.lru_cache(maxsize=1)
 def get_pdf_converter() -> Optional[DocumentConverter]:
     """
     Create and configure a DocumentConverter for PDF to markdown conversion.
 
+    The converter (and the OCR, table and picture models it loads) is built
+    once per process and reused for every split and every file.
+
     Returns:
         Optional[DocumentConverter]: The configured converter, or None if creation fails.
     """
@@ -210,17 +205,181 @@ def get_pdf_converter() -> Optional[DocumentConverter]:
         return None
 
 
+def clear_converter_cache() -> None:
+    """
+    Drop the cached DocumentConverter so its models can be freed.
+
+    The next call to :func:`get_pdf_converter` builds a fresh instance.
+    """
+    get_pdf_converter.cache_clear()
+
+
+def _conversion_workers() -> int:
+    """Return how many splits to convert concurrently (one per visible GPU)."""
+    if torch.cuda.is_available():
+        return max(torch.cuda.device_count(), 1)
+    return 1
+
+
+def _split_source(split_info: Dict[str, Any]) -> Union[str, DocumentStream]:
+    """Return what Docling should convert for a split: its path or a fresh stream."""
+    if "pdf_bytes" in split_info:
+        return DocumentStream(
+            name=split_info["file"], stream=io.BytesIO(split_info["pdf_bytes"])
+        )
+    return split_info["file"]
+
+
+def _is_out_of_memory(result: Any) -> bool:
+    """
+    Return whether Docling recorded an out-of-memory error in *result*.
+
+    Docling's threaded pipeline catches exceptions inside its stages, so a
+    CUDA OOM there only shows up as a PARTIAL_SUCCESS or FAILURE status with
+    the exception's message in ``result.errors``.
+    """
+    if result.status not in (
+        ConversionStatus.PARTIAL_SUCCESS,
+        ConversionStatus.FAILURE,
+    ):
+        return False
+    return any(
+        "out of memory" in error.error_message.lower() for error in result.errors
+    )
+
+
+def _convert_with_oom_retry(
+    pdf_converter: DocumentConverter, split_info: Dict[str, Any], index: int
+) -> Any:
+    """
+    Convert a split, retrying once after freeing GPU memory on CUDA OOM.
+
+    OOM is detected both when it propagates and when Docling only records it
+    in the result (see :func:`_is_out_of_memory`).  The CUDA cache is only
+    emptied on this recovery path; emptying it for every split forces a GPU
+    sync per page for no benefit.
+
+    Args:
+        pdf_converter (DocumentConverter): The shared converter.
+        split_info (Dict[str, Any]): Split info from :func:`iter_split_pdf` or
+            :func:`iter_split_pdf_bytes`.
+        index (int): The 0-based index of the split, for logging.
+
+    Returns:
+        Any: The Docling conversion result.
+    """
+    try:
+        result = pdf_converter.convert(
+            _split_source(split_info), raises_on_error=False
+        )
+        if not _is_out_of_memory(result):
+            return result
+    except torch.cuda.OutOfMemoryError:
+        pass
+
+    logger.warning(f"CUDA out of memory on split {index+1}; freeing cache and retrying")
+    gc.collect()
+    torch.cuda.empty_cache()
+    return pdf_converter.convert(_split_source(split_info), raises_on_error=False)
+
+
+def _picture_source(item: PictureItem, document: DoclingDocument) -> Dict[str, Any]:
+    """
+    Return the image data Docling already holds for a picture.
+
+    With ``generate_picture_images`` Docling stores each picture as a PNG data
+    URL; that string is kept so it can be sent to the LLM without decoding and
+    re-encoding.
+    """
+    data_url = None
+    if item.image is not None and str(item.image.uri).startswith("data:image/"):
+        data_url = str(item.image.uri)
+    return {"image": item.get_image(document), "data_url": data_url}
+
+
+def _convert_split(
+    pdf_converter: DocumentConverter, index: int, split_info: Dict[str, Any]
+) -> Tuple[int, List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Convert a single split PDF to per-page markdown.
+
+    Pictures are exported as placeholders; their images are taken directly
+    from the document's ``PictureItem`` objects so they never round-trip
+    through base64 inside the markdown.
+
+    Args:
+        pdf_converter (DocumentConverter): The shared converter.
+        index (int): The 0-based index of the split, used to restore ordering.
+        split_info (Dict[str, Any]): Split info from :func:`iter_split_pdf` or
+            :func:`iter_split_pdf_bytes`.
+
+    Returns:
+        Tuple[int, List[Dict[str, Any]], List[Dict[str, Any]]]: The split index,
+        its pages (see :func:`split_markdown_on_page_breaks`) and its pictures
+        (see :func:`_picture_source`) in reading order; both empty if the
+        conversion failed.
+    """
+    try:
+        logger.info(f"Processing split {index+1}: {split_info['file']}")
+
+        try:
+            result = _convert_with_oom_retry(pdf_converter, split_info, index)
+        except Exception as e:
+            logger.exception(f"Error converting split {index+1}")
+            result = None
+
+        if result is None or not hasattr(result, "document"):
+            logger.error(f"Conversion result is invalid for split {index+1}")
+            return index, [], []
+        if result.status == ConversionStatus.FAILURE:
+            errors = "; ".join(error.error_message for error in result.errors)
+            logger.error(f"Conversion failed for split {index+1}: {errors}")
+            return index, [], []
+
+        document = result.document
+        markdown_text = document.export_to_markdown(
+            page_break_placeholder=_PAGE_BREAK,
+            image_mode=ImageRefMode.PLACEHOLDER,
+            image_placeholder=IMAGE_PLACEHOLDER,
+        )
+        if not markdown_text:
+            return index, [], []
+
+        # Same traversal as the markdown export, so the k-th picture matches
+        # the k-th placeholder.  Text-only splits skip the traversal entirely.
+        pictures: List[Dict[str, Any]] = []
+        if document.pictures:
+            pictures = [
+                _picture_source(item, document)
+                for item, _ in document.iterate_items()
+                if isinstance(item, PictureItem)
+            ]
+
+        logger.info(f"Successfully converted split {index+1}")
+        pages = split_markdown_on_page_breaks(
+            markdown_text, start_page=split_info["start_page"]
+        )
+        return index, pages, pictures
+
+    except Exception as e:
+        logger.exception(f"Error processing split {index+1}")
+        return index, [], []
+
+
 def process_pdf(
-    file_path: str,
+    source: Union[str, bytes],
     pages_per_split: int = 1,
     context_lines_before: int = 5,
     context_lines_after: int = 5,
 ) -> List[Dict[str, Any]]:
     """
-    Process a PDF file, convert it to markdown, and process embedded images.
+    Process a PDF file, convert it to markdown, and describe its pictures.
+
+    Given the PDF's content as bytes (e.g. straight from MinIO), the whole
+    pipeline runs in memory and no split files are written.
 
     Args:
-        file_path (str): The path to the PDF file.
+        source (Union[str, bytes]): The path to the PDF file, or its content.
         pages_per_split (int, optional): Number of pages per split. Defaults to 1.
         context_lines_before (int, optional): Lines of context before an image. Defaults to 5.
         context_lines_after (int, optional): Lines of context after an image. Defaults to 5.
@@ -229,112 +388,96 @@ def process_pdf(
         List[Dict[str, Any]]: Ordered list of per-page dicts, each with keys
         ``'page_number'`` (int, 1-indexed) and ``'markdown'`` (str).
     """
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Input PDF file '{file_path}' does not exist")
-
-    split_files = split_pdf(file_path, pages_per_split)
-    markdown_parts = []
-
-    for i, split_info in enumerate(split_files):
-        try:
-            logger.info(
-                f"Processing split {i+1}/{len(split_files)}: {split_info['file']}"
-            )
+    if isinstance(source, bytes):
+        splits = iter_split_pdf_bytes(source, pages_per_split)
+    elif os.path.exists(source):
+        splits = iter_split_pdf(source, pages_per_split)
+    else:
+        raise FileNotFoundError(f"Input PDF file '{source}' does not exist")
+
+    pdf_converter = get_pdf_converter()
+    if pdf_converter is None:
+        logger.error("Failed to initialize PDF converter")
+        # Don't keep the failed result cached; retry on the next file.
+        clear_converter_cache()
+        return []
+
+    split_files: List[Dict[str, Any]] = []
+    indexed_pages: List[Tuple[int, List[Dict[str, Any]], List[Dict[str, Any]]]] = []
 
-            # Clear GPU cache before processing each split to manage memory
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-            gc.collect()
-
-            pdf_converter = None
-
-            try:
-                pdf_converter = get_pdf_converter()
-                if pdf_converter is None:
-                    logger.error(f"Failed to initialize PDF converter for split {i+1}")
-                    continue
-
-                result = pdf_converter.convert(split_info["file"])
-            except Exception as e:
-                logger.exception(f"Error converting split {i+1}")
-                result = None
-
-            if result is None or not hasattr(result, "document"):
-                logger.error(f"Conversion result is invalid for split {i+1}")
-                continue
-
-            markdown_text = result.document.export_to_markdown(
-                page_break_placeholder="<!-- page break -->",
-                image_mode="embedded",
-            )
-            if markdown_text:
-                markdown_parts.append(
-                    {
-                        "markdown": markdown_text,
-                        "start_page": split_info["start_page"],
-                        "end_page": split_info["end_page"],
-                    }
+    try:
+        # The main thread writes split PDFs while the pool converts the ones
+        # already on disk, so PDF writing overlaps with model inference.
+        with ThreadPoolExecutor(max_workers=_conversion_workers()) as executor:
+            futures = []
+            for i, split_info in enumerate(splits):
+                split_files.append(split_info)
+                futures.append(
+                    executor.submit(_convert_split, pdf_converter, i, split_info)
                 )
 
-                logger.info(f"Successfully converted split {i+1}")
-
-        except Exception as e:
-            logger.exception(f"Error processing split {i+1}")
-            continue
-        finally:
-            # Clear converter instance to free memory
-            if pdf_converter is not None:
-                del pdf_converter
-
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-            gc.collect()
-
-    # Combine markdown parts after processing all splits with page breaks
-    combined_markdown = combine_markdown_files(markdown_parts)
-
-    markdown_with_page_numbers = replace_page_breaks_with_numbers(
-        combined_markdown, start_page=1
-    )
-
-    extracted_images = extract_images_from_markdown(markdown_with_page_numbers)
-
-    if not extracted_images:
-        logger.info("No images found in document")
-        # Cleanup temporary files
+            for future in as_completed(futures):
+                indexed_pages.append(future.result())
+    finally:
         logger.info("Cleaning up temporary files...")
         for split_info in split_files:
+            if "pdf_bytes" in split_info:
+                continue
             try:
                 os.remove(split_info["file"])
             except OSError:
                 pass
 
-        return split_markdown_by_pages(markdown_with_page_numbers)
+    # Pages are already numbered by their split; just restore split order and
+    # scan each page for images as it is appended, so image ids stay global.
+    pages: List[Dict[str, Any]] = []
+    page_images: List[List[Dict[str, Any]]] = []
+    next_image_id = 1
+    for _, split_pages, split_pictures in sorted(indexed_pages, key=lambda x: x[0]):
+        pictures = iter(split_pictures)
+        for page in split_pages:
+            # Placeholders only exist for pictures, so text-only splits
+            # don't need to be scanned at all.
+            images: List[Dict[str, Any]] = []
+            if split_pictures:
+                images = extract_images_from_page(
+                    page["markdown"],
+                    page["page_number"],
+                    pictures,
+                    start_id=next_image_id,
+                )
+                next_image_id += len(images)
+            pages.append(page)
+            page_images.append(images)
+
+    extracted_images = [image for images in page_images for image in images]
+
+    if not extracted_images:
+        logger.info("No images found in document")
+        return pages
 
     contexts = []
 
-    for i, image_info in enumerate(extracted_images, 1):
-        # Extract context around this image
-        context = extract_context_around_image(
-            markdown_with_page_numbers,
-            i,  # image ID (1-indexed)
-            lines_before=context_lines_before,
-            lines_after=context_lines_after,
-        )
-        contexts.append(context["combined"])
-        logger.info(f"Extracted context for image {i}")
+    for page, images in zip(pages, page_images):
+        for local_id, image_info in enumerate(images, 1):
+            # Extract context around this image within its page
+            context = extract_context_around_image(
+                page["markdown"],
+                local_id,  # image index within the page (1-indexed)
+                lines_before=context_lines_before,
+                lines_after=context_lines_after,
+                span=image_info["span"],
+            )
+            contexts.append(context["combined"])
+            logger.info(f"Extracted context for image {image_info['id']}")
 
     # Run async image processing once for all images
     asyncio.run(process_images_async(extracted_images, contexts))
 
-    final_markdown = replace_images_with_descriptions(
-        markdown_with_page_numbers, extracted_images
-    )
-
-    for split_info in split_files:
-        try:
-            os.remove(split_info["file"])
-        except OSError:
-            pass
+    for page, images in zip(pages, page_images):
+        if images:
+            page["markdown"] = replace_images_with_descriptions(
+                page["markdown"], images
+            )
 
-    return split_markdown_by_pages(final_markdown)
+    return pages
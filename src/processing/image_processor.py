@@ -1,13 +1,31 @@
 import asyncio
 import base64
+import hashlib
+import io
+import os
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 
-from src.models.llm_factory import get_llm_client
+from langchain_ollama import ChatOllama
+from PIL import Image
+
+from src.config.settings import settings
+from src.models.llm_factory import create_llm_client
+from src.utils.json_cache import load_json_cache, update_json_cache
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Emitted by Docling for every picture when exporting with image_mode="placeholder".
+IMAGE_PLACEHOLDER = "<!-- image -->"
+_IMAGE_PLACEHOLDER_RE = re.compile(re.escape(IMAGE_PLACEHOLDER))
+
+# Returned by describe_image_with_llm_async on failure; never cached.
+_DESCRIPTION_ERROR = "Error generating description for image"
+
+# Image-hash -> description cache persisted across runs.
+_DESCRIPTION_CACHE_FILE = "image_descriptions.json"
+
 custom_prompt = """
 Provide a clear, detailed, and accurate description of the image from the TATA Power AGM report. The description should allow a reader to fully understand the image without seeing it.
 
@@ -27,89 +45,129 @@ The description should be complete enough for someone to reconstruct the image a
 """
 
 
-def extract_images_from_markdown(markdown_text: str) -> List[Dict[str, Any]]:
+def extract_images_from_page(
+    markdown: str,
+    page_number: int,
+    pictures: Iterator[Dict[str, Any]],
+    start_id: int = 1,
+) -> List[Dict[str, Any]]:
     """
-    Extract images from markdown with embedded base64 images.
+    Pair the image placeholders of a single page with Docling's picture images.
+
+    Placeholders appear in reading order, the same order in which the
+    document's ``PictureItem`` objects are iterated, so each placeholder takes
+    the next entry from ``pictures``.
 
     Args:
-        markdown_text (str): The markdown text containing embedded images.
+        markdown (str): The page markdown containing image placeholders.
+        page_number (int): The page the markdown belongs to (1-indexed).
+        pictures (Iterator[Dict[str, Any]]): Remaining pictures of the split, in
+            reading order, each with an ``image`` (PIL image or None) and a
+            ``data_url`` (Docling's already-encoded image, or None).
+        start_id (int, optional): The id to give the first image found, so ids
+            keep increasing across pages. Defaults to 1.
 
     Returns:
-        List[Dict[str, Any]]: A list of dictionaries containing image information.
+        List[Dict[str, Any]]: A list of dictionaries containing image information,
+        including the placeholder's ``span`` within ``markdown``.
     """
-    image_pattern = r"!\[([^\]]*)\]\(data:image/([^;]+);base64,([^)]+)\)"
-    matches = re.findall(image_pattern, markdown_text)
-
     extracted_images = []
 
-    for i, (alt_text, image_format, base64_data) in enumerate(matches, 1):
-        try:
-            # Decode base64 data for validation
-            image_data = base64.b64decode(base64_data)
+    for i, match in enumerate(_IMAGE_PLACEHOLDER_RE.finditer(markdown), start_id):
+        picture = next(pictures, None) or {}
+        image = picture.get("image")
+        data_url = picture.get("data_url")
+        if image is None and data_url is None:
+            logger.warning(f"No picture data for image {i} on page {page_number}")
 
-            image_info = {
+        extracted_images.append(
+            {
                 "id": i,
-                "alt_text": alt_text,
-                "format": image_format,
-                "base64_data": base64_data,
-                "file_size": len(image_data),
+                "format": "png",
+                "image": image,
+                "data_url": data_url,
+                "page_number": page_number,
+                "span": match.span(),
                 "description": None,
             }
+        )
+        if image is not None:
+            logger.info(
+                f"Found image {i} on page {page_number} ({image.width}x{image.height})"
+            )
 
-            extracted_images.append(image_info)
-            logger.info(f"Found image {i}: {alt_text} ({len(image_data)} bytes)")
+    return extracted_images
 
-        except Exception as e:
-            logger.exception(f"Error processing image {i}")
-            continue
 
-    return extracted_images
+def _line_window_start(text: str, pos: int, lines: int) -> int:
+    """Return the offset where the ``lines`` lines ending at ``pos`` begin."""
+    if lines <= 0:
+        return pos
+    start = pos
+    for _ in range(lines):
+        newline = text.rfind("\n", 0, start)
+        if newline == -1:
+            return 0
+        start = newline
+    return start + 1
+
+
+def _line_window_end(text: str, pos: int, lines: int) -> int:
+    """Return the offset where the ``lines`` lines starting at ``pos`` end."""
+    if lines <= 0:
+        return pos
+    end = pos - 1
+    for _ in range(lines):
+        newline = text.find("\n", end + 1)
+        if newline == -1:
+            return len(text)
+        end = newline
+    return end
 
 
 def extract_context_around_image(
-    markdown_text: str, image_id: int, lines_before: int = 5, lines_after: int = 5
+    markdown_text: str,
+    image_id: int,
+    lines_before: int = 5,
+    lines_after: int = 5,
+    span: Optional[Tuple[int, int]] = None,
 ) -> Dict[str, str]:
     """
     Extract context (text lines) around an image reference in the markdown.
 
+    Only the requested lines are scanned, so the cost does not grow with the
+    size of the document.
+
     Args:
         markdown_text (str): The full markdown text.
         image_id (int): The image ID/number (1-indexed).
         lines_before (int, optional): Number of lines to extract before the image. Defaults to 5.
         lines_after (int, optional): Number of lines to extract after the image. Defaults to 5.
+        span (Optional[Tuple[int, int]], optional): The image's ``(start, end)``
+            offsets, as recorded by :func:`extract_images_from_page`. When given,
+            ``image_id`` is ignored and no regex scan is needed. Defaults to None.
 
     Returns:
         Dict[str, str]: A dictionary with 'before', 'after', and 'combined' context.
     """
-    # Use the same pattern as extract_images_from_markdown to find base64 embedded images
-    image_pattern = r"!\[([^\]]*)\]\(data:image/([^;]+);base64,([^)]+)\)"
+    if span is None:
+        matches = list(_IMAGE_PLACEHOLDER_RE.finditer(markdown_text))
 
-    matches = list(re.finditer(image_pattern, markdown_text))
+        if image_id > len(matches) or image_id < 1:
+            return {"before": "", "after": "", "combined": ""}
 
-    if image_id > len(matches) or image_id < 1:
-        return {"before": "", "after": "", "combined": ""}
+        # Get the match for this specific image (1-indexed)
+        span = matches[image_id - 1].span()
 
-    # Get the match for this specific image (1-indexed)
-    match = matches[image_id - 1]
-    image_pos = match.start()
+    image_start, image_end = span
 
-    # Extract text before the image
-    text_before_image = markdown_text[:image_pos]
-    lines_before_list = text_before_image.split("\n")
-    context_before = (
-        "\n".join(lines_before_list[-lines_before:])
-        if len(lines_before_list) >= lines_before
-        else text_before_image
-    )
-
-    # Extract text after the image
-    text_after_image = markdown_text[match.end() :]
-    lines_after_list = text_after_image.split("\n")
-    context_after = (
-        "\n".join(lines_after_list[:lines_after])
-        if len(lines_after_list) >= lines_after
-        else text_after_image
-    )
+    # Extract text before and after the image
+    context_before = markdown_text[
+        _line_window_start(markdown_text, image_start, lines_before) : image_start
+    ]
+    context_after = markdown_text[
+        image_end : _line_window_end(markdown_text, image_end, lines_after)
+    ]
 
     # Combine context
     combined_context = (
@@ -148,16 +206,50 @@ def create_prompt_with_context(base_prompt: str, context: str) -> str:
         return base_prompt
 
 
+def encode_image(image: Image.Image, image_format: str = "png") -> str:
+    """
+    Serialize an image to a base64 data URL.
+
+    Args:
+        image (Image.Image): The image to encode.
+        image_format (str, optional): Target format. Defaults to "png".
+
+    Returns:
+        str: A ``data:image/<format>;base64,...`` URL.
+    """
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format.upper())
+    base64_data = base64.b64encode(buffer.getvalue()).decode("ascii")
+    return f"data:image/{image_format};base64,{base64_data}"
+
+
+def _image_url(image_info: Dict[str, Any]) -> Optional[str]:
+    """
+    Return the data URL to send for an image.
+
+    Docling already keeps picture images as PNG data URLs, so that string is
+    passed through as is; the PIL image is only encoded when it is missing.
+    """
+    if image_info.get("data_url"):
+        return image_info["data_url"]
+    if image_info.get("image") is not None:
+        return encode_image(image_info["image"], image_info["format"])
+    return None
+
+
 async def describe_image_with_llm_async(
-    base64_data: str, image_format: str, context: str = ""
+    image_url: str,
+    context: str = "",
+    llm_client: Optional[ChatOllama] = None,
 ) -> str:
     """
     Get detailed image description using LLM asynchronously.
 
     Args:
-        base64_data (str): Base64 encoded image data.
-        image_format (str): Image format (e.g., 'png', 'jpeg').
+        image_url (str): The image as a ``data:image/...;base64`` URL.
         context (str, optional): Optional context from surrounding text. Defaults to "".
+        llm_client (Optional[ChatOllama], optional): Client to use. Defaults to
+            a new one from :func:`create_llm_client`.
 
     Returns:
         str: Image description string.
@@ -172,21 +264,19 @@ async def describe_image_with_llm_async(
                 {"type": "text", "text": prompt_text},
                 {
                     "type": "image_url",
-                    "image_url": {
-                        "url": f"data:image/{image_format};base64,{base64_data}"
-                    },
+                    "image_url": {"url": image_url},
                 },
             ],
         }
 
-        llm_client = get_llm_client()
+        llm_client = llm_client or create_llm_client()
         # Use ainvoke for async operation
         response = await llm_client.ainvoke([message])
         llm_response = response.content
         return llm_response
     except Exception as e:
         logger.exception("Error describing image")
-        return "Error generating description for image"
+        return _DESCRIPTION_ERROR
 
 
 async def process_single_image(
@@ -194,6 +284,8 @@ async def process_single_image(
     i: int,
     image_info: Dict[str, Any],
     context: str,
+    llm_client: ChatOllama,
+    semaphore: asyncio.Semaphore,
 ) -> str:
     """
     Process a single image to generate its description.
@@ -203,64 +295,161 @@ async def process_single_image(
         i (int): The index of the current image (1-based).
         image_info (Dict[str, Any]): The dictionary containing image data.
         context (str): The surrounding text context.
+        llm_client (ChatOllama): The client shared by all image tasks.
+        semaphore (asyncio.Semaphore): Bounds the number of concurrent LLM requests.
 
     Returns:
         str: The generated description.
     """
-    logger.info(f"Getting description for image {i}/{len(extracted_images)}...")
-    description = await describe_image_with_llm_async(
-        image_info["base64_data"],
-        image_info["format"],
-        context=context,
-    )
+    image_url = _image_url(image_info)
+    if image_url is None:
+        return ""
+
+    async with semaphore:
+        logger.info(f"Getting description for image {i}/{len(extracted_images)}...")
+        description = await describe_image_with_llm_async(
+            image_url,
+            context=context,
+            llm_client=llm_client,
+        )
     image_info["description"] = description
     logger.info(f"✓ Description generated for image {i}")
     return description
 
 
+def _image_hash(image_info: Dict[str, Any]) -> Optional[str]:
+    """
+    Return a cache key for an image's content and the current LLM model.
+
+    Hashes Docling's encoded data URL when present, otherwise the raw pixels.
+    Returns None for placeholders without picture data.
+    """
+    digest = hashlib.sha256()
+    if image_info.get("data_url"):
+        digest.update(image_info["data_url"].encode("ascii"))
+    elif image_info.get("image") is not None:
+        image = image_info["image"]
+        digest.update(f"{image.mode}:{image.width}x{image.height}:".encode())
+        digest.update(image.tobytes())
+    else:
+        return None
+    return f"{settings.llm_model}:{digest.hexdigest()}"
+
+
+def _description_cache_path() -> str:
+    """Return the path of the on-disk image description cache."""
+    return os.path.join(settings.temporary_folder, _DESCRIPTION_CACHE_FILE)
+
+
 async def process_images_async(
     extracted_images: List[Dict[str, Any]], contexts: List[str]
 ) -> None:
     """
     Process all images concurrently using asyncio.
 
+    Identical images (by SHA-256 of their content) are described once and the
+    description is shared by every duplicate; descriptions are also cached on
+    disk under ``settings.temporary_folder`` so later runs skip known images.
+    At most ``settings.max_image_concurrency`` requests are in flight at once
+    so large documents don't flood the model server's queue.
+
     Args:
         extracted_images (List[Dict[str, Any]]): The list of extracted images.
         contexts (List[str]): The list of contexts corresponding to each image.
     """
+    # Group duplicate images by content hash (0-based indices).
+    dedup: Dict[str, List[int]] = {}
+    for idx, image_info in enumerate(extracted_images):
+        key = _image_hash(image_info)
+        if key is not None:
+            dedup.setdefault(key, []).append(idx)
+
+    cache = load_json_cache(_description_cache_path())
+    pending: List[Tuple[str, List[int]]] = []
+    for key, indices in dedup.items():
+        if key in cache:
+            for idx in indices:
+                extracted_images[idx]["description"] = cache[key]
+        else:
+            pending.append((key, indices))
+
+    logger.info(
+        f"{len(extracted_images)} images, {len(dedup)} unique, "
+        f"{len(pending)} to describe"
+    )
+    if not pending:
+        return
+
+    # One client for all tasks, created in this event loop: a client bound to
+    # the loop of an earlier asyncio.run fails with "Event loop is closed".
+    llm_client = create_llm_client()
+    semaphore = asyncio.Semaphore(max(settings.max_image_concurrency, 1))
+
+    # Describe the first occurrence of each unique image.
     tasks = [
-        process_single_image(extracted_images, i, image_info, contexts[i - 1])
-        for i, image_info in enumerate(extracted_images, 1)
+        process_single_image(
+            extracted_images,
+            indices[0] + 1,
+            extracted_images[indices[0]],
+            contexts[indices[0]],
+            llm_client,
+            semaphore,
+        )
+        for _, indices in pending
     ]
 
-    # Run all tasks concurrently
-    await asyncio.gather(*tasks)
+    # Run all tasks concurrently (bounded by the semaphore)
+    descriptions = await asyncio.gather(*tasks)
+
+    new_entries: Dict[str, str] = {}
+    for (key, indices), description in zip(pending, descriptions):
+        for idx in indices:
+            extracted_images[idx]["description"] = description
+        if description and description != _DESCRIPTION_ERROR:
+            new_entries[key] = description
+
+    if new_entries:
+        update_json_cache(_description_cache_path(), new_entries)
 
 
 def replace_images_with_descriptions(
     markdown_text: str, images: List[Dict[str, Any]]
 ) -> str:
     """
-    Replace image patterns with LLM descriptions.
+    Replace image placeholders with LLM descriptions.
+
+    When every image carries the ``span`` recorded by
+    :func:`extract_images_from_page`, the markdown is spliced by slicing with
+    no regex work.  Otherwise placeholders are replaced in order in a single
+    scan.
 
     Args:
-        markdown_text (str): The markdown text containing embedded images.
-        images (List[Dict[str, Any]]): List of image info dictionaries with descriptions.
+        markdown_text (str): The markdown text containing image placeholders.
+        images (List[Dict[str, Any]]): List of image info dictionaries with descriptions,
+            in the order their placeholders appear.
 
     Returns:
         str: Updated markdown with images replaced by descriptions.
     """
-    updated_markdown = markdown_text
-
-    for image_info in images:
-        # Find the original embedded image pattern
-        pattern = rf'!\[([^\]]*)\]\(data:image/{image_info["format"]};base64,{re.escape(image_info["base64_data"])}\)'
-
-        # Create replacement with description
-        description = image_info.get("description", "No description available.")
 
-        replacement = f"**[Image Description]**\n\n{description}"
-
-        updated_markdown = re.sub(pattern, replacement, updated_markdown)
-
-    return updated_markdown
+    def _replacement(image_info: Dict[str, Any]) -> str:
+        description = image_info.get("description") or "No description available."
+        return f"**[Image Description]**\n\n{description}"
+
+    if images and all("span" in image_info for image_info in images):
+        pieces = []
+        cursor = 0
+        for image_info in sorted(images, key=lambda img: img["span"][0]):
+            start, end = image_info["span"]
+            pieces.append(markdown_text[cursor:start])
+            pieces.append(_replacement(image_info))
+            cursor = end
+        pieces.append(markdown_text[cursor:])
+        return "".join(pieces)
+
+    replacements = iter([_replacement(image_info) for image_info in images])
+
+    return _IMAGE_PLACEHOLDER_RE.sub(
+        lambda m: next(replacements, m.group(0)),
+        markdown_text,
+    )
@@ -1,18 +1,35 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
+
+import urllib3
 from minio import Minio
+from minio.error import S3Error
 from src.config.settings import settings
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Files above this size are uploaded as multipart objects of _PART_SIZE parts.
+_MULTIPART_THRESHOLD = 64 * 1024 * 1024
+_PART_SIZE = 16 * 1024 * 1024
+
 
 class MinioClient:
     """
     MinIO Python client for interacting with MinIO storage.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, pool_size: int = 16) -> None:
         """
         Initialize the MinIO client using settings.
+
+        Requests go through a single keep-alive ``urllib3.PoolManager``, so
+        repeated downloads and uploads reuse open connections.
+
+        Args:
+            pool_size (int, optional): Maximum number of pooled connections. Defaults to 16.
         """
         if not settings.minio_root_user or not settings.minio_root_password:
             raise ValueError(
@@ -21,26 +38,54 @@ class MinioClient:
 
         self.endpoint = settings.minio_endpoint
         self.bucket_name = settings.minio_default_bucket
+        self._bucket_ready = False
+        # Mirrors the SDK's default pool (timeouts, retries) with an explicit size.
+        self._http = urllib3.PoolManager(
+            num_pools=pool_size,
+            maxsize=pool_size,
+            timeout=urllib3.Timeout(connect=300, read=300),
+            retries=urllib3.Retry(
+                total=5,
+                backoff_factor=0.2,
+                status_forcelist=[500, 502, 503, 504],
+            ),
+        )
         self._client = Minio(
             self.endpoint,
             access_key=settings.minio_root_user,
             secret_key=settings.minio_root_password,
             secure=False,
+            http_client=self._http,
         )
 
     def ensure_bucket(self) -> None:
         """
         Ensure that the default bucket exists, creating it if necessary.
+
+        Creation is attempted directly (one request, no ``bucket_exists``
+        probe) and the outcome is remembered, so later calls are free.
+        Credentials without ``s3:CreateBucket`` get AccessDenied even for an
+        existing bucket; only then is ``bucket_exists`` asked instead.
         """
+        if self._bucket_ready:
+            return
+
         try:
-            if not self._client.bucket_exists(self.bucket_name):
-                self._client.make_bucket(self.bucket_name)
-                logger.info(f"Created bucket: {self.bucket_name}")
-            else:
-                logger.info(f"Bucket {self.bucket_name} already exists.")
+            self._client.make_bucket(self.bucket_name)
+            logger.info("Created bucket: %s", self.bucket_name)
+        except S3Error as e:
+            exists = e.code in ("BucketAlreadyOwnedByYou", "BucketAlreadyExists") or (
+                e.code == "AccessDenied"
+                and self._client.bucket_exists(self.bucket_name)
+            )
+            if not exists:
+                logger.exception(f"Error ensuring bucket {self.bucket_name} exists.")
+                raise
+            logger.info("Bucket %s already exists.", self.bucket_name)
         except Exception as e:
             logger.exception(f"Error ensuring bucket {self.bucket_name} exists.")
             raise
+        self._bucket_ready = True
 
     def upload_file(
         self,
@@ -49,22 +94,63 @@ class MinioClient:
         content_type: str = "application/octet-stream",
     ) -> None:
         """
-        Upload a file to the MinIO bucket.
+        Upload a file to the MinIO bucket, creating the bucket on first use.
 
         Args:
             object_name (str): The name of the object in the bucket.
             file_path (str): The local path to the file to upload.
             content_type (str, optional): The content type of the file. Defaults to "application/octet-stream".
         """
+        self.ensure_bucket()
+
         try:
+            # Large files go up as multipart uploads with fixed-size parts.
+            part_size = (
+                _PART_SIZE if os.path.getsize(file_path) > _MULTIPART_THRESHOLD else 0
+            )
             self._client.fput_object(
-                self.bucket_name, object_name, file_path, content_type=content_type
+                self.bucket_name,
+                object_name,
+                file_path,
+                content_type=content_type,
+                part_size=part_size,
             )
-            logger.info(f"Uploaded {file_path} to {object_name}")
+            logger.info("Uploaded %s to %s", file_path, object_name)
         except Exception as e:
             logger.exception(f"Error uploading {file_path} to {object_name}")
             raise
 
+    def upload_files(
+        self,
+        pairs: List[Tuple[str, str]],
+        content_type: str = "application/octet-stream",
+        max_workers: int = 16,
+    ) -> None:
+        """
+        Upload several files to the MinIO bucket concurrently.
+
+        Per-object latency dominates small uploads, so files are sent from a
+        thread pool sharing this client's connection pool.
+
+        Args:
+            pairs (List[Tuple[str, str]]): ``(object_name, file_path)`` pairs to upload.
+            content_type (str, optional): The content type of the files. Defaults to "application/octet-stream".
+            max_workers (int, optional): Maximum number of concurrent uploads. Defaults to 16.
+        """
+        if not pairs:
+            return
+
+        # Once up front, rather than racing in every worker thread.
+        self.ensure_bucket()
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as executor:
+            futures = [
+                executor.submit(self.upload_file, object_name, file_path, content_type)
+                for object_name, file_path in pairs
+            ]
+            for future in futures:
+                future.result()
+
     def download_file(self, object_name: str, dest_path: str) -> None:
         """
         Download a file from the MinIO bucket.
@@ -75,11 +161,34 @@ class MinioClient:
         """
         try:
             self._client.fget_object(self.bucket_name, object_name, dest_path)
-            logger.info(f"Downloaded {object_name} to {dest_path}")
+            logger.info("Downloaded %s to %s", object_name, dest_path)
         except Exception as e:
             logger.exception(f"Error downloading {object_name} to {dest_path}")
             raise
 
+    def download_to_bytes(self, object_name: str) -> bytes:
+        """
+        Download an object from the MinIO bucket into memory.
+
+        Args:
+            object_name (str): The name of the object in the bucket.
+
+        Returns:
+            bytes: The object's content.
+        """
+        try:
+            response = self._client.get_object(self.bucket_name, object_name)
+            try:
+                data = response.read()
+            finally:
+                response.close()
+                response.release_conn()
+            logger.info("Downloaded %s (%d bytes)", object_name, len(data))
+            return data
+        except Exception as e:
+            logger.exception(f"Error downloading {object_name}")
+            raise
+
     def list_buckets(self) -> list:
         """
         List all buckets in the MinIO server.
@@ -92,3 +201,131 @@ class MinioClient:
         except Exception as e:
             logger.exception("Error listing buckets")
             raise
+
+
+class AsyncMinioClient:
+    """
+    Asynchronous S3 client for MinIO, built on ``aioboto3``.
+
+    A single event loop keeps many transfers in flight without a thread per
+    request.  Use it as an async context manager so one client, and its
+    connection pool, serves every call::
+
+        async with AsyncMinioClient() as client:
+            await client.upload_files(pairs)
+
+    ``aioboto3`` is an optional dependency (``uv sync --extra async``).
+    """
+
+    def __init__(self, max_concurrency: int = 64) -> None:
+        """
+        Initialize the async MinIO client using settings.
+
+        Args:
+            max_concurrency (int, optional): Maximum number of requests in flight. Defaults to 64.
+        """
+        if not settings.minio_root_user or not settings.minio_root_password:
+            raise ValueError(
+                "Missing MinIO credentials. Set MINIO_ROOT_USER and MINIO_ROOT_PASSWORD"
+            )
+
+        self.endpoint = settings.minio_endpoint
+        self.bucket_name = settings.minio_default_bucket
+        self._max_concurrency = max_concurrency
+        self._client_context: Optional[Any] = None
+        self._client: Optional[Any] = None
+
+    async def __aenter__(self) -> "AsyncMinioClient":
+        try:
+            import aioboto3
+            from aiobotocore.config import AioConfig
+        except ImportError as e:
+            raise ImportError(
+                "AsyncMinioClient requires aioboto3; install it with "
+                "'uv sync --extra async'"
+            ) from e
+
+        self._client_context = aioboto3.Session().client(
+            "s3",
+            endpoint_url=f"http://{self.endpoint}",
+            aws_access_key_id=settings.minio_root_user,
+            aws_secret_access_key=settings.minio_root_password,
+            config=AioConfig(max_pool_connections=self._max_concurrency),
+        )
+        self._client = await self._client_context.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self._client_context.__aexit__(*exc_info)
+        self._client = None
+        self._client_context = None
+
+    async def upload_file(
+        self,
+        object_name: str,
+        file_path: str,
+        content_type: str = "application/octet-stream",
+    ) -> None:
+        """
+        Upload a file to the MinIO bucket.
+
+        Args:
+            object_name (str): The name of the object in the bucket.
+            file_path (str): The local path to the file to upload.
+            content_type (str, optional): The content type of the file. Defaults to "application/octet-stream".
+        """
+        try:
+            await self._client.upload_file(
+                file_path,
+                self.bucket_name,
+                object_name,
+                ExtraArgs={"ContentType": content_type},
+            )
+            logger.info("Uploaded %s to %s", file_path, object_name)
+        except Exception as e:
+            logger.exception(f"Error uploading {file_path} to {object_name}")
+            raise
+
+    async def upload_files(
+        self,
+        pairs: List[Tuple[str, str]],
+        content_type: str = "application/octet-stream",
+    ) -> None:
+        """
+        Upload several files to the MinIO bucket concurrently.
+
+        Args:
+            pairs (List[Tuple[str, str]]): ``(object_name, file_path)`` pairs to upload.
+            content_type (str, optional): The content type of the files. Defaults to "application/octet-stream".
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def upload(object_name: str, file_path: str) -> None:
+            async with semaphore:
+                await self.upload_file(object_name, file_path, content_type)
+
+        await asyncio.gather(
+            *(upload(object_name, file_path) for object_name, file_path in pairs)
+        )
+
+    async def download_to_bytes(self, object_name: str) -> bytes:
+        """
+        Download an object from the MinIO bucket into memory.
+
+        Args:
+            object_name (str): The name of the object in the bucket.
+
+        Returns:
+            bytes: The object's content.
+        """
+        try:
+            response = await self._client.get_object(
+                Bucket=self.bucket_name, Key=object_name
+            )
+            async with response["Body"] as stream:
+                data = await stream.read()
+            logger.info("Downloaded %s (%d bytes)", object_name, len(data))
+            return data
+        except Exception as e:
+            logger.exception(f"Error downloading {object_name}")
+            raise
@@ -1,17 +1,154 @@
-from typing import List, Optional
+import asyncio
+import hashlib
+import io
+import itertools
+import json
+import os
+import struct
+import threading
+import uuid
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import psycopg2
 import psycopg2.errors
+from psycopg2.extensions import connection
+from psycopg2.extras import Json, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from langchain_core.documents import Document
 from langchain_community.vectorstores import PGVector
-from langchain_text_splitters import MarkdownTextSplitter
+from langchain_text_splitters import (
+    MarkdownHeaderTextSplitter,
+    RecursiveCharacterTextSplitter,
+)
 from langchain_ollama import OllamaEmbeddings
 
 from src.config.settings import settings
+from src.utils.json_cache import load_json_cache, update_json_cache
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Expression index so per-file DELETEs are index scans instead of seq scans.
+_DDL_IDX_FILE_ID = """
+CREATE INDEX IF NOT EXISTS idx_lpe_file_id
+    ON langchain_pg_embedding ((cmetadata->>'file_id'));
+"""
+
+# Parent chunks returned to the LLM at retrieval time; only their children
+# are embedded and each child's cmetadata carries its parent_id.  Parent ids
+# are content hashes, so unchanged parents keep their id across re-runs.
+_DDL_PARENTS = """
+CREATE TABLE IF NOT EXISTS langchain_pg_parents (
+    parent_id  TEXT PRIMARY KEY,
+    file_id    TEXT NOT NULL,
+    document   TEXT NOT NULL,
+    cmetadata  JSONB
+);
+CREATE INDEX IF NOT EXISTS idx_lpp_file_id ON langchain_pg_parents (file_id);
+"""
+
+# Texts sent to Ollama per embedding request, and requests in flight at once.
+_EMBED_BATCH_SIZE = 64
+_EMBED_CONCURRENCY = 8
+
+# Rows per multi-row INSERT when storing parent chunks with execute_values;
+# embeddings are written with binary COPY instead.
+_INSERT_PAGE_SIZE = 500
+
+# Framing of PostgreSQL's binary COPY format: signature, flags and header
+# extension length up front, a -1 field count as the trailer.
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_COPY_TRAILER = struct.pack("!h", -1)
+
+# Parents are split at h1-h3 headings first, then bounded in tokens; each
+# parent is split again into the small children that get embedded.
+_PARENT_CHUNK_SIZE_TOKENS = 512
+_PARENT_CHUNK_OVERLAP_TOKENS = 50
+_CHILD_CHUNK_SIZE_TOKENS = 100
+_CHILD_CHUNK_OVERLAP_TOKENS = 10
+
+_HEADER_SPLITTER = MarkdownHeaderTextSplitter(
+    headers_to_split_on=[("#", "h1"), ("##", "h2"), ("###", "h3")],
+    strip_headers=False,
+)
+
+# On-disk memo of SemanticChunker output, keyed by model and parent text hash.
+_SEMANTIC_CHUNK_CACHE_FILE = "semantic_chunks.json"
+
+# Shared embeddings client; constructing it does not contact the server.
+_EMBEDDINGS = OllamaEmbeddings(model=settings.embedding_model)
+
+_pool: Optional[ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
+_schema_ready = False
+
+# Bounds the SQLAlchemy engine each cached PGVector store owns.
+_ENGINE_ARGS = {"pool_size": 8, "pool_pre_ping": True}
+
+
+def _get_pool() -> ThreadedConnectionPool:
+    """
+    Return the process-wide psycopg2 connection pool, creating it on first use.
+
+    Created lazily so importing this module never opens a connection.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadedConnectionPool(2, 16, settings.database_url)
+    return _pool
+
+
+@contextmanager
+def _pooled_connection() -> Iterator[connection]:
+    """
+    Borrow a connection from the pool for one transaction.
+
+    Commits when the block exits cleanly, rolls back if it raises, and always
+    returns the connection to the pool.
+    """
+    pool = _get_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn)
+
+
+def _ensure_schema() -> None:
+    """
+    Create the parents table and the ``file_id`` indexes, once per process.
+
+    Runs in its own short transaction: ``CREATE INDEX IF NOT EXISTS`` takes a
+    SHARE lock on the table even when the index exists, which inside a
+    transaction that goes on to write would deadlock concurrent workers.
+
+    Raises:
+        psycopg2.errors.UndefinedTable: If ``langchain_pg_embedding`` does
+            not exist yet.
+    """
+    global _schema_ready
+
+    if _schema_ready:
+        return
+
+    try:
+        with _pooled_connection() as conn, conn.cursor() as cursor:
+            cursor.execute(_DDL_PARENTS)
+            cursor.execute(_DDL_IDX_FILE_ID)
+    except (psycopg2.errors.UniqueViolation, psycopg2.errors.DuplicateTable):
+        # Another worker created the same objects concurrently.
+        pass
+    _schema_ready = True
+
 
 class VectorStoreConfig:
     """
@@ -38,41 +175,29 @@ class VectorStoreConfig:
 
     def get_or_create(self) -> PGVector:
         """
-        Get an existing vector store connection or create a new one.
-
-        Returns:
-            PGVector: The vector store instance.
-        """
-        vector_store = self.get_connection()
-        if vector_store is None:
-            vector_store = self.create_vector_store()
-        return vector_store
+        Get the vector store, creating its tables and collection if needed.
 
-    def get_connection(self) -> Optional[PGVector]:
-        """
-        Attempt to connect to an existing vector store index.
+        The store is cached per connection, collection and embedding model,
+        so repeated calls reuse one SQLAlchemy engine.
 
         Returns:
-            Optional[PGVector]: The vector store instance if successful, None otherwise.
+            PGVector: The vector store instance.
         """
-        try:
-            vector_store = PGVector.from_existing_index(
-                embedding=self.embeddings,
-                collection_name=self.collection_name,
-                connection_string=self.connection,
-                use_jsonb=True,
-            )
-            return vector_store
-        except Exception as e:
-            logger.warning(
-                f"Could not connect to existing index (it may not exist yet): {e}"
-            )
-            return None
+        return _make_store(
+            self.connection,
+            self.collection_name,
+            getattr(self.embeddings, "model", None),
+        )
 
     def create_vector_store(self) -> PGVector:
         """
         Create a new vector store instance.
 
+        Built with the constructor rather than ``PGVector.from_existing_index``,
+        which drops ``use_jsonb`` and ``engine_args``; the constructor creates
+        missing tables (with a ``jsonb`` cmetadata column) and the collection,
+        and attaches to existing ones.
+
         Returns:
             PGVector: The newly created vector store instance.
         """
@@ -81,59 +206,524 @@ class VectorStoreConfig:
             collection_name=self.collection_name,
             connection_string=self.connection,
             use_jsonb=True,
+            engine_args=_ENGINE_ARGS,
         )
         return vector_store
 
 
-def clear_embedding(file_id: str) -> int:
+@lru_cache(maxsize=16)
+def _make_store(
+    connection: str, collection_name: str, model_name: Optional[str]
+) -> PGVector:
     """
-    Clear existing embeddings for a specific file ID from the database.
+    Build the PGVector store for a connection, collection and embedding model.
 
     Args:
-        file_id (str): The ID of the file whose embeddings should be cleared.
+        connection (str): The database connection string.
+        collection_name (str): The name of the collection in the vector store.
+        model_name (Optional[str]): The Ollama embedding model, if any.
+
+    Returns:
+        PGVector: The vector store instance.
+    """
+    if model_name is None:
+        embeddings = None
+    elif model_name == settings.embedding_model:
+        embeddings = _EMBEDDINGS
+    else:
+        embeddings = OllamaEmbeddings(model=model_name)
+
+    config = VectorStoreConfig(
+        embeddings=embeddings, connection=connection, collection_name=collection_name
+    )
+    return config.create_vector_store()
+
+
+def get_vector_store(collection_name: str) -> PGVector:
+    """
+    Return the process-wide PGVector store for *collection_name*.
+
+    The store is created (with its tables and collection) on first use and
+    reused afterwards, instead of building a new engine for every file.
+
+    Args:
+        collection_name (str): The name of the collection in the vector store.
+
+    Returns:
+        PGVector: The vector store instance.
+    """
+    return VectorStoreConfig(
+        embeddings=_EMBEDDINGS,
+        connection=settings.database_url,
+        collection_name=collection_name,
+    ).get_or_create()
+
+
+def clear_embeddings(file_ids: List[str]) -> int:
+    """
+    Clear existing embeddings for several file IDs with a single DELETE.
+
+    The ``idx_lpe_file_id`` expression index (see :func:`_ensure_schema`)
+    keeps the lookup on ``cmetadata->>'file_id'`` from scanning the whole table.
+
+    Args:
+        file_ids (List[str]): The IDs of the files whose embeddings should be cleared.
 
     Returns:
         int: The number of deleted chunks.
     """
-    connection_string = settings.database_url
+    if not file_ids:
+        return 0
 
     try:
-        conn = psycopg2.connect(connection_string)
-        cursor = conn.cursor()
-    except Exception as e:
-        logger.exception("Failed to connect to the database to clear embeddings.")
-        raise
+        _ensure_schema()
+        with _pooled_connection() as conn, conn.cursor() as cursor:
+            delete_query = """
+                DELETE FROM langchain_pg_embedding
+                WHERE cmetadata->>'file_id' = ANY(%s)
+            """
 
-    try:
-        delete_query = """
-            DELETE FROM langchain_pg_embedding
-            WHERE cmetadata->>'file_id' = %s
-        """
+            cursor.execute(delete_query, ([str(file_id) for file_id in file_ids],))
+            deleted_count = cursor.rowcount
 
-        cursor.execute(delete_query, (str(file_id),))
-        deleted_count = cursor.rowcount
-        conn.commit()
+            cursor.execute(
+                "DELETE FROM langchain_pg_parents WHERE file_id = ANY(%s)",
+                ([str(file_id) for file_id in file_ids],),
+            )
 
         if deleted_count > 0:
-            logger.info(f"Deleted {deleted_count} chunks for file_id: {file_id}")
+            logger.info("Deleted %d chunks for file_ids: %s", deleted_count, file_ids)
         else:
-            logger.info(f"No existing embeddings found for file_id: {file_id}")
+            logger.info("No existing embeddings found for file_ids: %s", file_ids)
 
         return deleted_count
 
     except psycopg2.errors.UndefinedTable:
-        conn.rollback()
         logger.info(
             "Table 'langchain_pg_embedding' does not exist yet. Skipping clear."
         )
         return 0
     except Exception as e:
-        conn.rollback()
-        logger.exception(f"Error clearing embeddings for file_id {file_id}")
+        logger.exception(f"Error clearing embeddings for file_ids {file_ids}")
         raise
-    finally:
-        cursor.close()
-        conn.close()
+
+
+def clear_embedding(file_id: str) -> int:
+    """
+    Clear existing embeddings for a specific file ID from the database.
+
+    Args:
+        file_id (str): The ID of the file whose embeddings should be cleared.
+
+    Returns:
+        int: The number of deleted chunks.
+    """
+    return clear_embeddings([file_id])
+
+
+def _content_sha(*parts: str) -> str:
+    """Return the hex SHA-256 of *parts*, NUL-separated."""
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _get_token_splitters() -> Tuple[
+    RecursiveCharacterTextSplitter, RecursiveCharacterTextSplitter
+]:
+    """
+    Return the parent and child splitters, loading the tokenizer on first use.
+
+    Returns:
+        Tuple[RecursiveCharacterTextSplitter, RecursiveCharacterTextSplitter]:
+        The parent and child splitters, measuring length in tokens of
+        ``settings.chunk_tokenizer``.
+    """
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(settings.chunk_tokenizer)
+    parent_splitter = RecursiveCharacterTextSplitter.from_huggingface_tokenizer(
+        tokenizer,
+        chunk_size=_PARENT_CHUNK_SIZE_TOKENS,
+        chunk_overlap=_PARENT_CHUNK_OVERLAP_TOKENS,
+    )
+    child_splitter = RecursiveCharacterTextSplitter.from_huggingface_tokenizer(
+        tokenizer,
+        chunk_size=_CHILD_CHUNK_SIZE_TOKENS,
+        chunk_overlap=_CHILD_CHUNK_OVERLAP_TOKENS,
+    )
+    return parent_splitter, child_splitter
+
+
+def _split(doc: Document) -> Tuple[List[Document], List[Document]]:
+    """
+    Split one document into parent chunks and their embeddable children.
+
+    Parents are cut at markdown headings, then bounded in tokens; each gets a
+    content-derived ``parent_id`` that its children inherit through their
+    metadata.
+    """
+    parent_splitter, child_splitter = _get_token_splitters()
+
+    sections = _HEADER_SPLITTER.split_text(doc.page_content)
+    for section in sections:
+        section.metadata = {**doc.metadata, **section.metadata}
+
+    parents = parent_splitter.split_documents(sections)
+    for parent in parents:
+        parent.metadata["parent_id"] = _content_sha(
+            parent.page_content,
+            json.dumps(parent.metadata, sort_keys=True, default=str),
+        )
+
+    if settings.chunking_strategy == "semantic":
+        # Children come from _split_semantic, which calls the embeddings server.
+        return parents, []
+    return parents, child_splitter.split_documents(parents)
+
+
+def _split_documents(
+    docs: List[Document],
+) -> Tuple[List[Document], List[Document]]:
+    """
+    Split documents into parent and child chunks.
+
+    Runs in the calling process: embed_file already runs in one of the main
+    ingestion workers, and a nested spawn pool would re-import torch, Docling
+    and the tokenizer in every child, costing more than the split itself.
+
+    Args:
+        docs (List[Document]): The documents to split.
+
+    Returns:
+        Tuple[List[Document], List[Document]]: The parents and the children,
+        each in document order.
+    """
+    results = [_split(doc) for doc in docs]
+
+    parents = list(itertools.chain.from_iterable(p for p, _ in results))
+    children = list(itertools.chain.from_iterable(c for _, c in results))
+    return parents, children
+
+
+@lru_cache(maxsize=1)
+def _get_semantic_chunker():
+    """
+    Return the SemanticChunker used when CHUNKING_STRATEGY is "semantic".
+
+    ``langchain-experimental`` is an optional dependency, so it is only
+    imported when semantic chunking is actually requested.
+    """
+    from langchain_experimental.text_splitter import SemanticChunker
+
+    return SemanticChunker(
+        embeddings=_EMBEDDINGS,
+        breakpoint_threshold_type="percentile",
+        breakpoint_threshold_amount=95,
+    )
+
+
+def _semantic_cache_path() -> str:
+    """Return the path of the on-disk semantic chunk cache."""
+    return os.path.join(settings.temporary_folder, _SEMANTIC_CHUNK_CACHE_FILE)
+
+
+def _split_semantic(parents: List[Document]) -> List[Document]:
+    """
+    Split parents into children at topic shifts with SemanticChunker.
+
+    SemanticChunker embeds every sentence to find its breakpoints, so results
+    are memoized on disk per parent text; re-processing an unchanged file
+    skips that first embedding pass entirely.
+
+    Args:
+        parents (List[Document]): Parent chunks with ``parent_id`` in metadata.
+
+    Returns:
+        List[Document]: The child chunks, each carrying its parent's metadata.
+    """
+    cache = load_json_cache(_semantic_cache_path())
+    new_entries: Dict[str, List[str]] = {}
+    children: List[Document] = []
+
+    for parent in parents:
+        key = hashlib.sha256(
+            f"{settings.embedding_model}:{parent.page_content}".encode("utf-8")
+        ).hexdigest()
+        texts = cache.get(key) or new_entries.get(key)
+        if texts is None:
+            texts = _get_semantic_chunker().split_text(parent.page_content)
+            new_entries[key] = texts
+        children.extend(
+            Document(page_content=text, metadata=dict(parent.metadata))
+            for text in texts
+        )
+
+    if new_entries:
+        update_json_cache(_semantic_cache_path(), new_entries)
+    return children
+
+
+def _store_parents(cursor: Any, file_id: str, parents: List[Document]) -> None:
+    """
+    Store parent chunks in ``langchain_pg_parents``, keyed by ``parent_id``.
+
+    Args:
+        cursor (Any): A cursor inside the caller's open transaction.
+        file_id (str): The unique identifier for the file.
+        parents (List[Document]): Parent chunks with ``parent_id`` in metadata.
+    """
+    execute_values(
+        cursor,
+        """
+        INSERT INTO langchain_pg_parents
+            (parent_id, file_id, document, cmetadata)
+        VALUES %s
+        ON CONFLICT (parent_id) DO NOTHING
+        """,
+        [
+            (
+                parent.metadata["parent_id"],
+                str(file_id),
+                parent.page_content,
+                Json(parent.metadata),
+            )
+            for parent in parents
+        ],
+        page_size=_INSERT_PAGE_SIZE,
+    )
+
+
+def _indexed_chunks(file_id: str) -> Dict[str, Optional[str]]:
+    """
+    Return the ``uuid`` -> ``content_sha`` map of the chunks stored for *file_id*.
+
+    Rows written before content hashes were recorded map to ``None``.
+
+    Args:
+        file_id (str): The unique identifier for the file.
+
+    Returns:
+        Dict[str, Optional[str]]: Stored chunk uuids (as text) and their
+        content hashes.
+    """
+    try:
+        with _pooled_connection() as conn, conn.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT uuid::text, cmetadata->>'content_sha'
+                FROM langchain_pg_embedding
+                WHERE cmetadata->>'file_id' = %s
+                """,
+                (str(file_id),),
+            )
+            rows = cursor.fetchall()
+        return dict(rows)
+    except psycopg2.errors.UndefinedTable:
+        return {}
+
+
+def _delete_stale_rows(
+    cursor: Any, file_id: str, chunk_ids: List[str], keep_parent_ids: List[str]
+) -> None:
+    """
+    Delete outdated chunks and the parents no longer produced for *file_id*.
+
+    Args:
+        cursor (Any): A cursor inside the caller's open transaction.
+        file_id (str): The unique identifier for the file.
+        chunk_ids (List[str]): Uuids of ``langchain_pg_embedding`` rows to delete.
+        keep_parent_ids (List[str]): Parent ids still in use for the file.
+    """
+    if chunk_ids:
+        cursor.execute(
+            "DELETE FROM langchain_pg_embedding WHERE uuid = ANY(%s::uuid[])",
+            (chunk_ids,),
+        )
+    cursor.execute(
+        """
+        DELETE FROM langchain_pg_parents
+        WHERE file_id = %s AND NOT (parent_id = ANY(%s))
+        """,
+        (str(file_id), keep_parent_ids),
+    )
+    if chunk_ids:
+        logger.info(
+            "Deleted %d outdated chunks for file_id: %s", len(chunk_ids), file_id
+        )
+
+
+def get_parent_documents(parent_ids: List[str]) -> Dict[str, Document]:
+    """
+    Fetch parent chunks by id, e.g. for the ``parent_id`` of retrieved children.
+
+    Args:
+        parent_ids (List[str]): The parent ids to look up.
+
+    Returns:
+        Dict[str, Document]: The parents found, keyed by ``parent_id``.
+    """
+    if not parent_ids:
+        return {}
+
+    try:
+        with _pooled_connection() as conn, conn.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT parent_id, document, cmetadata
+                FROM langchain_pg_parents
+                WHERE parent_id = ANY(%s)
+                """,
+                (list(parent_ids),),
+            )
+            rows = cursor.fetchall()
+    except psycopg2.errors.UndefinedTable:
+        return {}
+
+    return {
+        parent_id: Document(page_content=document, metadata=cmetadata or {})
+        for parent_id, document, cmetadata in rows
+    }
+
+
+async def _aembed_texts(texts: List[str]) -> List[List[float]]:
+    """
+    Embed texts in ``_EMBED_BATCH_SIZE`` batches with concurrent requests.
+
+    Each batch is a single ``/api/embed`` call; at most ``_EMBED_CONCURRENCY``
+    batches are in flight at once so the server stays busy without being
+    flooded.
+
+    Args:
+        texts (List[str]): The chunk texts to embed.
+
+    Returns:
+        List[List[float]]: One vector per input text, in order.
+    """
+    semaphore = asyncio.Semaphore(_EMBED_CONCURRENCY)
+    # Its httpx AsyncClient binds to the first event loop it runs on, and
+    # every _embed_texts call runs a new one, so the client is not shared.
+    embeddings = OllamaEmbeddings(model=settings.embedding_model)
+
+    async def embed_batch(batch: List[str]) -> List[List[float]]:
+        async with semaphore:
+            return await embeddings.aembed_documents(batch)
+
+    results = await asyncio.gather(
+        *(
+            embed_batch(texts[start : start + _EMBED_BATCH_SIZE])
+            for start in range(0, len(texts), _EMBED_BATCH_SIZE)
+        )
+    )
+    return list(itertools.chain.from_iterable(results))
+
+
+def _embed_texts(texts: List[str]) -> List[List[float]]:
+    """
+    Embed texts in batches; synchronous wrapper of :func:`_aembed_texts`.
+
+    Args:
+        texts (List[str]): The chunk texts to embed.
+
+    Returns:
+        List[List[float]]: One vector per input text, in order.
+    """
+    return asyncio.run(_aembed_texts(texts))
+
+
+def _copy_field(data: bytes) -> bytes:
+    """Return *data* as one binary COPY field: int32 length, then the bytes."""
+    return struct.pack("!i", len(data)) + data
+
+
+def _encode_copy_rows(
+    collection_id: str,
+    texts: List[str],
+    vectors: List[List[float]],
+    metadatas: List[Dict[str, Any]],
+) -> io.BytesIO:
+    """
+    Encode ``langchain_pg_embedding`` rows in PostgreSQL's binary COPY format.
+
+    Vectors go over the wire in pgvector's binary layout (int16 dimensions,
+    int16 unused, big-endian float4 values) straight from a float32 numpy
+    array, so no float is ever formatted as text or parsed back by the
+    server.
+
+    Args:
+        collection_id (str): The uuid of the target collection.
+        texts (List[str]): The chunk texts.
+        vectors (List[List[float]]): One embedding per text.
+        metadatas (List[Dict[str, Any]]): One metadata dict per text.
+
+    Returns:
+        io.BytesIO: The COPY payload, positioned at the start.
+    """
+    full = np.asarray(vectors, dtype=">f4")
+
+    field_count = struct.pack("!h", 6)
+    vector_header = struct.pack("!HH", full.shape[1] if full.ndim == 2 else 0, 0)
+    collection_field = _copy_field(uuid.UUID(str(collection_id)).bytes)
+
+    buffer = io.BytesIO()
+    buffer.write(_COPY_HEADER)
+    for i, (text, metadata) in enumerate(zip(texts, metadatas)):
+        row_id = uuid.uuid4()
+        buffer.write(field_count)
+        # The primary key is a uuid column: its binary form is the 16 raw bytes.
+        buffer.write(_copy_field(row_id.bytes))
+        buffer.write(collection_field)
+        buffer.write(_copy_field(vector_header + full[i].tobytes()))
+        buffer.write(_copy_field(text.encode("utf-8")))
+        # jsonb's binary format is a version byte followed by the JSON text.
+        buffer.write(_copy_field(b"\x01" + json.dumps(metadata).encode("utf-8")))
+        # PGVector.delete(ids=...) matches on custom_id, so the id goes there
+        # as text too.
+        buffer.write(_copy_field(str(row_id).encode("ascii")))
+    buffer.write(_COPY_TRAILER)
+    buffer.seek(0)
+    return buffer
+
+
+def _bulk_insert_embeddings(
+    cursor: Any,
+    collection_name: str,
+    texts: List[str],
+    vectors: List[List[float]],
+    metadatas: List[Dict[str, Any]],
+) -> int:
+    """
+    Insert precomputed embeddings into ``langchain_pg_embedding`` in bulk.
+
+    All rows are streamed with one binary ``COPY`` (see
+    :func:`_encode_copy_rows`) inside the caller's transaction.  The
+    collection must already exist (see :meth:`VectorStoreConfig.get_or_create`).
+
+    Args:
+        cursor (Any): A cursor inside the caller's open transaction.
+        collection_name (str): The name of the target collection.
+        texts (List[str]): The chunk texts.
+        vectors (List[List[float]]): One embedding per text.
+        metadatas (List[Dict[str, Any]]): One metadata dict per text.
+
+    Returns:
+        int: The number of inserted rows.
+    """
+    cursor.execute(
+        "SELECT uuid FROM langchain_pg_collection WHERE name = %s",
+        (collection_name,),
+    )
+    row = cursor.fetchone()
+    if row is None:
+        raise ValueError(f"Collection {collection_name!r} does not exist")
+    collection_id = row[0]
+
+    columns = "uuid, collection_id, embedding, document, cmetadata, custom_id"
+
+    cursor.copy_expert(
+        f"COPY langchain_pg_embedding ({columns}) FROM STDIN WITH (FORMAT BINARY)",
+        _encode_copy_rows(collection_id, texts, vectors, metadatas),
+    )
+    return len(texts)
 
 
 def embed_file(
@@ -142,7 +732,16 @@ def embed_file(
     docs: List[Document],
 ) -> bool:
     """
-    Split documents and embed them into the vector store.
+    Split documents into parent/child chunks and embed the children.
+
+    Chunks are keyed by a content hash (``content_sha`` in cmetadata): only
+    chunks not already indexed for *file_id* are embedded, and only stored
+    chunks that no longer occur are deleted, so re-processing an unchanged
+    file makes no embedding requests.
+
+    Parents are stored in ``langchain_pg_parents``; each embedded child keeps
+    its parent's ``parent_id`` so retrieval can return the wider context via
+    :func:`get_parent_documents`.
 
     Args:
         file_id (str): The unique identifier for the file.
@@ -152,34 +751,76 @@ def embed_file(
     Returns:
         bool: True if embedding was successful and chunks were added, False otherwise.
     """
-    # Clears existing embedding for the same file id
-    clear_embedding(file_id)
-
-    child_splitter = MarkdownTextSplitter(chunk_size=3000, chunk_overlap=500)
-    all_docs = []
-    for doc in docs:
-        sub_docs = child_splitter.split_documents([doc])
-        for sub_doc in sub_docs:
-            all_docs.append(sub_doc)
-
-    # Embed all chunks directly
-    if all_docs:
-        try:
-            embeddings = OllamaEmbeddings(model=settings.embedding_model)
-            PGVector.from_documents(
-                embedding=embeddings,
-                documents=all_docs,
-                collection_name=settings.collection_name,
-                connection_string=settings.database_url,
-                use_jsonb=True,
-            )
+    parents, all_docs = _split_documents(docs)
+    if settings.chunking_strategy == "semantic":
+        all_docs = _split_semantic(parents)
+
+    if not all_docs:
+        clear_embedding(file_id)
+        logger.warning("No valid chunks to embed for file: %s", file_name)
+        return False
+
+    try:
+        # Key every chunk by its content (incl. parent), dropping duplicates.
+        wanted: Dict[str, Document] = {}
+        for doc in all_docs:
+            sha = _content_sha(doc.metadata["parent_id"], doc.page_content)
+            doc.metadata["content_sha"] = sha
+            wanted.setdefault(sha, doc)
+
+        # Diff against what is already indexed: only changed chunks are
+        # deleted, embedded and inserted.
+        seen = set()
+        stale_ids = []
+        for chunk_id, sha in _indexed_chunks(file_id).items():
+            if sha in wanted and sha not in seen:
+                seen.add(sha)
+            else:
+                stale_ids.append(chunk_id)
+        new_docs = [doc for sha, doc in wanted.items() if sha not in seen]
+        keep_parent_ids = [parent.metadata["parent_id"] for parent in parents]
+
+        if not new_docs and not stale_ids:
             logger.info(
-                f"Embedded {len(all_docs)} chunks from {file_name} into vector store"
+                "%s is unchanged; all %d chunks are indexed", file_name, len(seen)
             )
             return True
-        except Exception as e:
-            logger.exception(f"Failed to embed documents for {file_name}")
-            return False
-    else:
-        logger.warning(f"No valid chunks to embed for file: {file_name}")
+
+        # Network work happens before the transaction opens: embed the new
+        # chunks in batches and make sure the tables and collection exist.
+        texts = [doc.page_content for doc in new_docs]
+        metadatas = [doc.metadata for doc in new_docs]
+        vectors = _embed_texts(texts) if texts else []
+        get_vector_store(settings.collection_name)
+        _ensure_schema()
+
+        # Deletes and inserts commit together, with one WAL flush that is not
+        # waited for.  synchronous_commit=off can only lose the last few
+        # commits on a server crash, which is safe here: re-ingesting is
+        # idempotent, since unchanged chunks are skipped by content hash.
+        with _pooled_connection() as conn, conn.cursor() as cursor:
+            cursor.execute("SET LOCAL synchronous_commit = off")
+            cursor.execute("SET LOCAL work_mem = '64MB'")
+            _delete_stale_rows(cursor, file_id, stale_ids, keep_parent_ids)
+            if new_docs:
+                _store_parents(cursor, file_id, parents)
+                _bulk_insert_embeddings(
+                    cursor,
+                    settings.collection_name,
+                    texts,
+                    vectors,
+                    metadatas,
+                )
+
+        logger.info(
+            "Embedded %d new chunks (%d unchanged, %d parents) from %s into "
+            "vector store",
+            len(new_docs),
+            len(seen),
+            len(parents),
+            file_name,
+        )
+        return True
+    except Exception as e:
+        logger.exception(f"Failed to embed documents for {file_name}")
         return False
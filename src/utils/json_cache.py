@@ -0,0 +1,51 @@
+import json
+import os
+from typing import Any, Dict
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def load_json_cache(path: str) -> Dict[str, Any]:
+    """
+    Load a JSON object cache from disk.
+
+    Args:
+        path (str): The path of the cache file.
+
+    Returns:
+        Dict[str, Any]: The cached entries, or an empty dict if the file is
+        missing or does not hold a JSON object.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def update_json_cache(path: str, new_entries: Dict[str, Any]) -> None:
+    """
+    Merge ``new_entries`` into the JSON object cache at *path*.
+
+    The file is re-read before writing and replaced atomically, so concurrent
+    worker processes only ever race on individual entries.  Write failures
+    are logged, not raised: the cache is only an optimization.
+
+    Args:
+        path (str): The path of the cache file.
+        new_entries (Dict[str, Any]): The entries to add or overwrite.
+    """
+    cache = load_json_cache(path)
+    cache.update(new_entries)
+
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        logger.exception("Failed to persist cache %s", path)
@@ -1,5 +1,39 @@
+import atexit
 import logging
+import queue
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+# Records are handed to a background thread that does the blocking stdout
+# write.  QueueHandler.prepare still merges the message with its arguments
+# (and renders any traceback) on the calling thread; only the final line
+# formatting and the I/O move off hot paths.
+_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+def _start_listener() -> None:
+    """Start the process-wide queue listener writing to stdout, once."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setLevel(logging.INFO)
+
+        formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        )
+        handler.setFormatter(formatter)
+
+        _listener = QueueListener(_queue, handler)
+        _listener.start()
+        # Flushes queued records before the interpreter exits.
+        atexit.register(_listener.stop)
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -17,14 +51,7 @@ def get_logger(name: str) -> logging.Logger:
     if not logger.handlers:
         logger.setLevel(logging.INFO)
 
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setLevel(logging.INFO)
-
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-        handler.setFormatter(formatter)
-
-        logger.addHandler(handler)
+        _start_listener()
+        logger.addHandler(QueueHandler(_queue))
 
     return logger